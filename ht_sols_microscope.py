@@ -1,14 +1,17 @@
 # Imports from the python standard library:
 import atexit
+import math
 import os
-import queue
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Third party imports, installable via pip:
 import napari
 import numpy as np
-from scipy.ndimage import zoom, rotate, gaussian_filter1d
+from scipy.ndimage import zoom, affine_transform, gaussian_filter1d
 from tifffile import imread, imwrite
 
 # Our code, one .py file per module, copy files to your local directory:
@@ -38,6 +41,7 @@ except Exception as e:
 M1 = 200 / 5; Mscan = 100 / 100; M3 = 250 / 9;
 camera_px_um = 6.5
 tilt = np.deg2rad(55)
+cos_tilt, sin_tilt, tan_tilt = np.cos(tilt), np.sin(tilt), np.tan(tilt)
 dichroic_mirror_options = {'ZT405/488/561/640rpc'   :0}
 emission_filter_options = {'Shutter'                :0,
                            'Open'                   :1,
@@ -56,6 +60,9 @@ objective1_options = {'name'  :('Nikon 40x0.95 air',
                       'BFP_um':(0, -137, -12023),
                       # min working distance spec:
                       'WD_um' :(170, 590, 240)}
+# reverse lookup table; 'Z_drive' position to objective1 index:
+objective1_BFP_um_to_index = {
+    um:i for i, um in enumerate(objective1_options['BFP_um'])}
 
 class Microscope:
     def __init__(self,
@@ -63,47 +70,37 @@ class Microscope:
                  ao_rate,               # slow ~1e3, medium ~1e4, fast ~1e5
                  name='HT-SOLS v1.1',
                  verbose=True,
-                 print_warnings=True):
+                 print_warnings=True,
+                 max_init_threads=4):   # hardware opened in parallel
         self.max_allocated_bytes = max_allocated_bytes
         self.name = name
         self.verbose = verbose
         self.print_warnings = print_warnings
         if self.verbose: print("%s: opening..."%self.name)
-        self.unfinished_tasks = queue.Queue()
-        # init hardware/software:
-        slow_fw_init = ct.ResultThread(
-            target=self._init_filter_wheel).start() #~5.3s
-        slow_camera_init = ct.ResultThread(
-            target=self._init_camera).start()       #~3.6s
-        slow_zoom_lens_init = ct.ResultThread(
-            target=self._init_zoom_lens).start()    #~1.5s        
-        slow_lasers_init = ct.ResultThread(
-            target=self._init_lasers).start()       #~1.1s        
-        slow_snoutfocus_init = ct.ResultThread(
-            target=self._init_snoutfocus).start()   #1s
-        slow_focus_init = ct.ResultThread(
-            target=self._init_focus_piezo).start()  #~0.6s
-        slow_XY_stage_init = ct.ResultThread(
-            target=self._init_XY_stage).start()     #~0.4s
-        slow_Z_stage_init = ct.ResultThread(
-            target=self._init_Z_stage).start()      #~0.3s
-        slow_Z_drive_init = ct.ResultThread(
-            target=self._init_Z_drive).start()      #~0.07s
-        slow_autofocus_init = ct.ResultThread(
-            target=self._init_autofocus).start()    #~0.015s
-        self._init_display()                        #~1.3s
-        self._init_datapreview()                    #~0.8s
-        self._init_ao(ao_rate)                      #~0.2s
-        slow_autofocus_init.get_result()
-        slow_Z_drive_init.get_result()
-        slow_Z_stage_init.get_result()
-        slow_XY_stage_init.get_result()
-        slow_focus_init.get_result()
-        slow_snoutfocus_init.get_result()
-        slow_lasers_init.get_result()
-        slow_zoom_lens_init.get_result()
-        slow_camera_init.get_result()
-        slow_fw_init.get_result()
+        self.unfinished_tasks = deque() # append/popleft are thread safe
+        # persistent pool for short hardware jobs (no thread per job):
+        self._hw_pool = ThreadPoolExecutor(thread_name_prefix='hw')
+        # display (~1.3s) and datapreview (~0.8s) open on first use:
+        self._display, self._datapreview, self._filesaving = 3 * (None,)
+        self._lazy_init_lock = threading.Lock()
+        # init hardware/software: (slowest first, so with 4 threads the rest
+        # finish in the shadow of the filter wheel)
+        with ThreadPoolExecutor(max_workers=max_init_threads) as init_pool:
+            slow_inits = [init_pool.submit(init) for init in (
+                self._init_filter_wheel,    #~5.3s
+                self._init_camera,          #~3.6s
+                self._init_zoom_lens,       #~1.5s
+                self._init_lasers,          #~1.1s
+                self._init_snoutfocus,      #1s
+                self._init_focus_piezo,     #~0.6s
+                self._init_XY_stage,        #~0.4s
+                self._init_Z_stage,         #~0.3s
+                self._init_Z_drive,         #~0.07s
+                self._init_autofocus,       #~0.015s
+                )]
+            self._init_ao(ao_rate)          #~0.2s
+            for slow_init in slow_inits:
+                slow_init.result() # re-raises any init error
         # configure autofocus: (Z_drive, focus_piezo and autofocus initialized)
         self.autofocus.set_current_objective(self.objective1 + 1)
         z_range_um = min(objective1_options['WD_um']) # a reasonable choice
@@ -137,7 +134,15 @@ class Microscope:
         self.dichroic_mirror = tuple(dichroic_mirror_options.keys())[0]
         self.num_active_data_buffers = 0
         self.num_active_preview_buffers = 0
+        self._data_buffer_pool = [] # released buffers, ready for re-use
+        self._preview_buffer_pool = []
+        self._data_buffer_released = threading.Condition()
+        self._preview_buffer_released = threading.Condition()
+        self._displayed_preview = None # on screen -> not back in the pool
+        self._displayed_preview_released = False # acquire done with it?
+        self._frame_timing_px = None # set with the camera in 'apply_settings'
         self._settings_applied = False
+        self.on_settings_changed = None # optional callback(status_dict)
         if self.verbose: print("\n%s: -> open and ready."%self.name)
 
     def _init_filter_wheel(self):
@@ -217,8 +222,8 @@ class Microscope:
             verbose=False)
         self.Z_drive_position_um = round(self.Z_drive.position_um[2]) # ch = 2
         # check z position is legal and assign objective1:
-        self.objective1 = objective1_options['BFP_um'].index(
-            self.Z_drive_position_um)
+        self.objective1 = objective1_BFP_um_to_index[
+            self.Z_drive_position_um]
         self.objective1_name  = objective1_options['name'][self.objective1]
         self.objective1_WD_um = objective1_options['WD_um'][self.objective1]        
         if self.verbose:
@@ -235,14 +240,40 @@ class Microscope:
 
     def _init_display(self):
         if self.verbose: print("\n%s: opening display..."%self.name)  
-        self.display = display(display_type=_CustomNapariDisplay)
+        self._display = display(display_type=_CustomNapariDisplay)
         if self.verbose: print("\n%s: -> display open."%self.name) 
 
     def _init_datapreview(self):
         if self.verbose: print("\n%s: opening datapreview..."%self.name) 
-        self.datapreview = ct.ObjectInSubprocess(DataPreview)
+        self._datapreview = ct.ObjectInSubprocess(DataPreview)
         if self.verbose: print("\n%s: -> datapreview open."%self.name)        
 
+    def _init_filesaving(self):
+        if self.verbose: print("\n%s: opening filesaving..."%self.name)
+        self._filesaving = ct.ObjectInSubprocess(_FileSaving)
+        if self.verbose: print("\n%s: -> filesaving open."%self.name)
+
+    @property
+    def display(self): # not opened until needed (e.g. first acquire)
+        with self._lazy_init_lock:
+            if self._display is None:
+                self._init_display()
+        return self._display
+
+    @property
+    def datapreview(self): # not opened until needed (e.g. first acquire)
+        with self._lazy_init_lock:
+            if self._datapreview is None:
+                self._init_datapreview()
+        return self._datapreview
+
+    @property
+    def filesaving(self): # not opened until needed (e.g. first save)
+        with self._lazy_init_lock:
+            if self._filesaving is None:
+                self._init_filesaving()
+        return self._filesaving
+
     def _init_ao(self, ao_rate):
         self.illumination_sources = ( # controlled by ao
             'LED', '405', '488', '561', '640', '405_on_during_rolling')
@@ -268,6 +299,15 @@ class Microscope:
             'LSy_IMG'           : 19,
             'shear'             : 20,
             }
+        # Reverse lookup table; channel numbers to names:
+        n2c = self.names_to_voltage_channels # nickname
+        self.voltage_channels_to_names = {c:n for n, c in n2c.items()}
+        # (TTL, power) voltage channels per illumination source (LED no TTL):
+        self.illumination_sources_to_voltage_channels = {}
+        for source in self.illumination_sources:
+            laser = source.split('_')[0] # e.g. '405_on_during_rolling'
+            self.illumination_sources_to_voltage_channels[source] = (
+                n2c.get(laser + '_TTL'), n2c[laser + '_power'])
         if self.verbose: print("\n%s: opening ao card..."%self.name)
         self.ao = ni_PCIe_6738.DAQ(
             num_channels=21, rate=ao_rate, verbose=False)
@@ -306,7 +346,7 @@ class Microscope:
             self.preview_line_px,
             self.preview_crop_px,
             self.timestamp_mode)
-        self.bytes_per_preview_buffer = 2 * int(np.prod(self.preview_shape))
+        self.bytes_per_preview_buffer = 2 * math.prod(self.preview_shape)
         self.preview_buffer_exceeded = False
         if self.bytes_per_preview_buffer > self.max_bytes_per_buffer:
             self.preview_buffer_exceeded = True
@@ -329,13 +369,19 @@ class Microscope:
                       " or increase 'max_allocated_bytes'")
         return None
 
-    def _calculate_voltages(self):
-        n2c = self.names_to_voltage_channels # nickname
-        # Timing information:
+    def _calculate_frame_timing_px(self):
         exposure_px = self.ao.s2p(1e-6 * self.camera.exposure_us)
         rolling_px =  self.ao.s2p(1e-6 * self.camera.rolling_time_us)
         jitter_px = max(self.ao.s2p(30e-6), 1)
         period_px = max(exposure_px, rolling_px) + jitter_px
+        return rolling_px, jitter_px, period_px
+
+    def _calculate_voltages(self):
+        n2c = self.names_to_voltage_channels # nickname
+        # Timing information: (updated with the camera in 'apply_settings')
+        if self._frame_timing_px is None: # camera branch not reached yet
+            self._frame_timing_px = self._calculate_frame_timing_px()
+        rolling_px, jitter_px, period_px = self._frame_timing_px
         # Galvo voltages:
         galvo_volts_per_um = 0.011395 # calibrated using laser spot
         galvo_scan_volts = galvo_volts_per_um * self.scan_range_um
@@ -344,48 +390,49 @@ class Microscope:
         # Shear galvo voltages:
         galvo_volts_per_px = 0.0021097 # calibrated using AMS-AGY edge
         galvo_shear_volts = galvo_volts_per_px * self.galvo_shear_px
-        # Calculate voltages:
-        voltages = []
-        # Add preframes (if any):
-        for frames in range(self.camera_preframes):
-            v = np.zeros((period_px, self.ao.num_channels), 'float64')
-            v[:rolling_px, n2c['camera']] = 5 # falling edge-> light on!
-            voltages.append(v)
-        for volumes in range(self.volumes_per_buffer):
-            # TODO: either bidirectional volumes, or smoother galvo flyback
-            slices = self.slices_per_volume
-            if self.projection_mode: slices = 1
-            for _slice in range(slices):
-                for channel, power in zip(self.channels_per_slice,
-                                          self.power_per_channel):
-                    v = np.zeros((period_px, self.ao.num_channels), 'float64')
-                    v[:rolling_px, n2c['camera']] = 5 # falling edge-> light on!
-                    light_on_px = rolling_px
-                    if channel in ('405_on_during_rolling',): light_on_px = 0
-                    if channel != 'LED': # i.e. laser channels
-                        v[light_on_px:period_px - jitter_px,
-                          n2c[channel + '_TTL']] = 3
-                    v[light_on_px:period_px - jitter_px,
-                      n2c[channel + '_power']] = 4.5 * power / 100
-                    # light sheet focus adjust:
-                    v[:, n2c['LSx_BFP']] = self.ls_focus_adjust_v
-                    ramp_px = period_px - jitter_px - light_on_px
-                    if self.projection_mode:
-                        gs_v = galvo_scan_volts / 2
-                        v[light_on_px:period_px - jitter_px,
-                          n2c['galvo']] = np.linspace(-gs_v, gs_v, ramp_px)
-                        # shear galvos:
-                        sh_v = galvo_shear_volts / 2
-                        v[light_on_px:period_px - jitter_px,
-                          n2c['shear']] = np.linspace(-sh_v, sh_v, ramp_px)
-                    else:
-                        v[:, n2c['galvo']] = galvo_voltages[_slice]
-                        # light sheet angular dither:
-                        ad_v = self.ls_angular_dither_v
-                        v[light_on_px:period_px - jitter_px,
-                          n2c['LSx_IMG']] = np.linspace(-ad_v, ad_v, ramp_px)
-                    voltages.append(v)
-        voltages = np.concatenate(voltages, axis=0)
+        # Calculate voltages: (1 period per camera frame, preframes first)
+        # TODO: either bidirectional volumes, or smoother galvo flyback
+        slices = self.slices_per_volume
+        if self.projection_mode: slices = 1
+        channels = len(self.channels_per_slice)
+        frames = (self.camera_preframes +
+                  self.volumes_per_buffer * slices * channels)
+        voltages = np.zeros(
+            (frames, period_px, self.ao.num_channels), 'float64')
+        voltages[:, :rolling_px, n2c['camera']] = 5 # falling edge-> light on!
+        # View the frames after the preframes as (volumes, slices, channels):
+        v = voltages[self.camera_preframes:, :, :].reshape(
+            self.volumes_per_buffer, slices, channels,
+            period_px, self.ao.num_channels)
+        # light sheet focus adjust:
+        v[:, :, :, :, n2c['LSx_BFP']] = self.ls_focus_adjust_v
+        # Choose the mode once: (ramps are played while the light is on)
+        if self.projection_mode:
+            ramps = ((n2c['galvo'], galvo_scan_volts / 2),
+                     (n2c['shear'], galvo_shear_volts / 2)) # shear galvos
+        else:
+            v[:, :, :, :, n2c['galvo']] = galvo_voltages[
+                :, np.newaxis, np.newaxis] # 1 galvo position per slice
+            ramps = ((n2c['LSx_IMG'], self.ls_angular_dither_v),) # dither
+        unit_ramps = {} # -1 -> 1 ramps (by length), scaled for each use
+        for c, (channel, power) in enumerate(zip(self.channels_per_slice,
+                                                 self.power_per_channel)):
+            vc = v[:, :, c, :, :] # every volume and slice for this channel
+            TTL_c, power_c = self.illumination_sources_to_voltage_channels[
+                channel]
+            light_on_px = rolling_px
+            if channel in ('405_on_during_rolling',): light_on_px = 0
+            if TTL_c is not None: # i.e. laser channels
+                vc[:, :, light_on_px:period_px - jitter_px, TTL_c] = 3
+            vc[:, :, light_on_px:period_px - jitter_px, power_c] = (
+                4.5 * power / 100)
+            ramp_px = period_px - jitter_px - light_on_px
+            if ramp_px not in unit_ramps:
+                unit_ramps[ramp_px] = np.linspace(-1, 1, ramp_px)
+            for ramp_c, ramp_v in ramps:
+                vc[:, :, light_on_px:period_px - jitter_px, ramp_c] = (
+                    ramp_v * unit_ramps[ramp_px])
+        voltages = voltages.reshape(frames * period_px, self.ao.num_channels)
         # Timing attributes:
         self.buffer_time_s = self.ao.p2s(voltages.shape[0])
         self.volumes_per_s = self.volumes_per_buffer / self.buffer_time_s
@@ -393,8 +440,7 @@ class Microscope:
 
     def _plot_voltages(self):
         import matplotlib.pyplot as plt
-        # Reverse lookup table; channel numbers to names:
-        c2n = {v:k for k, v in self.names_to_voltage_channels.items()}
+        c2n = self.voltage_channels_to_names # nickname
         for c in range(self.voltages.shape[1]):
             plt.plot(self.voltages[:, c], label=c2n.get(c, f'ao-{c}'))
         plt.legend(loc='upper right')
@@ -408,13 +454,13 @@ class Microscope:
         self, filename, folder_name, description, display, preview_only):
         def make_folders(folder_name):
             os.makedirs(folder_name)
-            os.makedirs(folder_name + '\\data')
-            os.makedirs(folder_name + '\\metadata')
-            os.makedirs(folder_name + '\\preview')                    
+            for subfolder in ('data', 'metadata', 'preview'):
+                os.makedirs(os.path.join(folder_name, subfolder))
         assert type(filename) is str
+        now = datetime.now() # one timestamp for folder name and metadata
         if folder_name is None:
             folder_index = 0
-            dt = datetime.strftime(datetime.now(),'%Y-%m-%d_%H-%M-%S')
+            dt = datetime.strftime(now,'%Y-%m-%d_%H-%M-%S')
             folder_name = dt + '_%03i_ht_sols'%folder_index
             while os.path.exists(folder_name): # check overwriting
                 folder_index +=1
@@ -422,14 +468,14 @@ class Microscope:
             make_folders(folder_name)
         else:
             if not os.path.exists(folder_name): make_folders(folder_name)
-        data_path =     folder_name + '\\data\\'     + filename
-        metadata_path = folder_name + '\\metadata\\' + filename
-        preview_path =  folder_name + '\\preview\\'  + filename
+        data_path =     os.path.join(folder_name, 'data',     filename)
+        metadata_path = os.path.join(folder_name, 'metadata', filename)
+        preview_path =  os.path.join(folder_name, 'preview',  filename)
         # save metadata:
         to_save = {
             # date and time:
-            'Date':datetime.strftime(datetime.now(),'%Y-%m-%d'),
-            'Time':datetime.strftime(datetime.now(),'%H:%M:%S'),
+            'Date':datetime.strftime(now,'%Y-%m-%d'),
+            'Time':datetime.strftime(now,'%H:%M:%S'),
             # args from 'acquire':
             'filename':filename,
             'folder_name':folder_name,
@@ -493,35 +539,83 @@ class Microscope:
             'dichroic_mirror':self.dichroic_mirror,
             }
         with open(os.path.splitext(metadata_path)[0] + '.txt', 'w') as file:
-            for k, v in to_save.items():
-                file.write(k + ': ' + str(v) + '\n')
+            file.write(''.join('%s: %s\n'%(k, v) for k, v in to_save.items()))
         return data_path, preview_path
 
-    def _get_data_buffer(self, shape, dtype):
-        while self.num_active_data_buffers >= self.max_data_buffers:
-            time.sleep(1e-3) # 1.7ms min
+    def _reuse_or_allocate_buffer(self, buffer_pool, shape, dtype):
+        # Call with the matching '_released' condition held
+        shape, dtype = tuple(shape), np.dtype(dtype)
+        # settings changed -> free any old buffers (e.g. from late acquires):
+        buffer_pool[:] = [b for b in buffer_pool
+                          if b.shape == shape and b.dtype == dtype]
+        if len(buffer_pool) > 0:
+            return buffer_pool.pop() # memory is already paged in
         # Note: this does not actually allocate the memory. Allocation happens
         # during the first 'write' process inside camera.record_to_memory
-        data_buffer = ct.SharedNDArray(shape, dtype)
-        self.num_active_data_buffers += 1
+        return ct.SharedNDArray(shape, dtype)
+
+    def _get_data_buffer(self, shape, dtype):
+        with self._data_buffer_released: # sleep until a buffer is free
+            self._data_buffer_released.wait_for(
+                lambda: self.num_active_data_buffers < self.max_data_buffers)
+            data_buffer = self._reuse_or_allocate_buffer(
+                self._data_buffer_pool, shape, dtype)
+            self.num_active_data_buffers += 1
         return data_buffer
 
     def _release_data_buffer(self, shared_numpy_array):
         assert isinstance(shared_numpy_array, ct.SharedNDArray)
-        self.num_active_data_buffers -= 1
+        with self._data_buffer_released:
+            self._data_buffer_pool.append(shared_numpy_array)
+            self.num_active_data_buffers -= 1
+            self._data_buffer_released.notify()
 
     def _get_preview_buffer(self, shape, dtype):
-        while self.num_active_preview_buffers >= self.max_preview_buffers:
-            time.sleep(1e-3) # 1.7ms min
-        # Note: this does not actually allocate the memory. Allocation happens
-        # during the first 'write' process inside camera.record_to_memory
-        preview_buffer = ct.SharedNDArray(shape, dtype)
-        self.num_active_preview_buffers += 1
+        with self._preview_buffer_released: # sleep until a buffer is free
+            self._preview_buffer_released.wait_for(
+                lambda: (self.num_active_preview_buffers <
+                         self.max_preview_buffers))
+            preview_buffer = self._reuse_or_allocate_buffer(
+                self._preview_buffer_pool, shape, dtype)
+            self.num_active_preview_buffers += 1
         return preview_buffer
 
     def _release_preview_buffer(self, shared_numpy_array):
         assert isinstance(shared_numpy_array, ct.SharedNDArray)
-        self.num_active_preview_buffers -= 1
+        with self._preview_buffer_released:
+            if shared_numpy_array is self._displayed_preview:
+                self._displayed_preview_released = True # pool when replaced
+            else:
+                self._preview_buffer_pool.append(shared_numpy_array)
+            self.num_active_preview_buffers -= 1
+            self._preview_buffer_released.notify()
+
+    def _set_displayed_preview(self, shared_numpy_array):
+        # napari keeps showing the last preview, so it can't be re-used yet:
+        with self._preview_buffer_released:
+            replaced = self._displayed_preview
+            if replaced is not None and self._displayed_preview_released:
+                self._preview_buffer_pool.append(replaced)
+            self._displayed_preview = shared_numpy_array
+            self._displayed_preview_released = False
+
+    def get_status(self): # plain dict of the values set by apply_settings
+        return {
+            'sample_px_um':             self.sample_px_um,
+            'bytes_per_data_buffer':    self.bytes_per_data_buffer,
+            'data_buffer_exceeded':     self.data_buffer_exceeded,
+            'bytes_per_preview_buffer': self.bytes_per_preview_buffer,
+            'preview_buffer_exceeded':  self.preview_buffer_exceeded,
+            'total_bytes':              self.total_bytes,
+            'total_bytes_exceeded':     self.total_bytes_exceeded,
+            'buffer_time_s':            getattr(self, 'buffer_time_s', 0),
+            'volumes_per_s':            getattr(self, 'volumes_per_s', 0),
+            }
+
+    def _notify_settings_changed(self): # called from the settings thread
+        if self.on_settings_changed is not None:
+            self.on_settings_changed(self.get_status())
+        return None
 
     def snoutfocus(self, filename=None, settle_vibrations=True):
         def snoutfocus_task(custody):
@@ -563,18 +657,16 @@ class Microscope:
             piezo_settling_px = self.ao.s2p(0.000) # Not yet measured
             period_px = (max(exp_px, roll_px, piezo_settling_px) + jitter_px)
             n2c = self.names_to_voltage_channels # A temporary nickname
-            v_open_shutter = np.zeros((self.ao.s2p(5*1e-3), # Shutter open time
-                                       self.ao.num_channels), 'float64')
-            v_open_shutter[:, n2c['snoutfocus_shutter']] = 5
-            voltages = [v_open_shutter] # insert the shutter open array first
-            for piezo_voltage in piezo_voltages:
-                v = np.zeros((period_px, self.ao.num_channels), 'float64')
-                v[:, n2c['snoutfocus_shutter']] = 5
-                v[:roll_px, n2c['camera']] = 5
-                v[:, n2c['snoutfocus_piezo']] = (
-                    10 * (piezo_voltage / piezo_limit_v)) # 10 V
-                voltages.append(v)
-            voltages = np.concatenate(voltages, axis=0)
+            open_shutter_px = self.ao.s2p(5*1e-3) # Shutter open time
+            voltages = np.zeros((open_shutter_px + images * period_px,
+                                 self.ao.num_channels), 'float64')
+            voltages[:, n2c['snoutfocus_shutter']] = 5 # open shutter first
+            # View the frames after the shutter opens as 1 period per image:
+            v = voltages[open_shutter_px:, :].reshape(
+                images, period_px, self.ao.num_channels)
+            v[:, :roll_px, n2c['camera']] = 5
+            v[:, :, n2c['snoutfocus_piezo']] = (
+                10 * (piezo_voltages / piezo_limit_v))[:, np.newaxis] # 10 V
             # Allocate memory and finalize microscope settings:
             data_buffer = self._get_data_buffer(
                 (images, self.camera.height_px, self.camera.width_px), 'uint16')
@@ -588,9 +680,8 @@ class Microscope:
             self.ao.play_voltages(voltages, block=False) # Ends at 0 V
             camera_thread.get_result()
             # Start cleaning up after ourselves:
-            write_voltages_thread = ct.ResultThread(
-                target=self.ao._write_voltages,
-                args=(old_voltages,)).start()
+            write_voltages_future = self._hw_pool.submit(
+                self.ao._write_voltages, old_voltages)
             self.filter_wheel.move(old_fw_pos, block=False)
             # Inspect the images to find/set best snoutfocus piezo position:
             if np.max(data_buffer) < 5 * np.min(data_buffer):
@@ -612,7 +703,7 @@ class Microscope:
             self.camera._arm(self.camera._num_buffers)
             self.snoutfocus_piezo._finish_set_voltage(polling_wait_s=0)
             self.filter_wheel._finish_moving()
-            write_voltages_thread.get_result()
+            write_voltages_future.result()
             self._settings_applied = True
             if settle_vibrations:
                     time.sleep(2)
@@ -620,7 +711,7 @@ class Microscope:
             if filename is not None:
                 if not os.path.exists('ht_sols_snoutfocus'):
                     os.makedirs('ht_sols_snoutfocus')
-                path = 'ht_sols_snoutfocus\\' + filename
+                path = os.path.join('ht_sols_snoutfocus', filename)
                 if self.verbose:
                     print("%s: saving '%s'"%(self.name, path))
                 imwrite(path, data_buffer[:, np.newaxis, :, :], imagej=True)
@@ -628,7 +719,7 @@ class Microscope:
             self._release_data_buffer(data_buffer)
         snoutfocus_thread = ct.CustodyThread(
             target=snoutfocus_task, first_resource=self.camera).start()
-        self.unfinished_tasks.put(snoutfocus_thread)
+        self.unfinished_tasks.append(snoutfocus_thread)
         return snoutfocus_thread
 
     def apply_settings( # Must call before .acquire()
@@ -660,6 +751,7 @@ class Microscope:
         ):
         args = locals()
         args.pop('self')
+        settings_changed = any(v is not None for v in args.values())
         def settings_task(custody):
             custody.switch_from(None, to=self.camera) # Safe to change settings
             self._settings_applied = False # In case the thread crashes
@@ -708,10 +800,10 @@ class Microscope:
                 # calculate projection pixels along light-sheet/chip:
                 # 'law of sines':
                 total_scan_px = self.scan_range_um / self.sample_px_um
-                phi = np.deg2rad(self.projection_angle_deg)
-                gam = np.pi - phi - tilt
+                phi = math.radians(self.projection_angle_deg) # scalar math
+                gam = math.pi - phi - tilt
                 self.galvo_shear_px = int(
-                    round(total_scan_px * np.sin(phi) / np.sin(gam)))
+                    round(total_scan_px * math.sin(phi) / math.sin(gam)))
                 # work out and legalize the correct h_px, w_px and roi:
                 h_px, w_px = height_px, width_px # shorthand
                 if height_px is None: h_px = self.height_px
@@ -730,6 +822,7 @@ class Microscope:
             if (self.data_buffer_exceeded or
                 self.preview_buffer_exceeded or
                 self.total_bytes_exceeded):
+                if settings_changed: self._notify_settings_changed()
                 custody.switch_from(self.camera, to=None)
                 return None
             # Send hardware commands, slowest to fastest:
@@ -741,12 +834,11 @@ class Microscope:
                 if XY_stage_position_mm[2] == 'absolute':
                     self.XY_stage.move_mm(x, y, relative=False, block=False)
             else: # must update XY stage attributes if joystick was used
-                update_XY_stage_position_thread = ct.ResultThread(
-                    target=self.XY_stage.get_position_mm).start()
+                update_XY_stage_position_future = self._hw_pool.submit(
+                    self.XY_stage.get_position_mm)
             if sample_ri is not None:
-                set_zoom_lens_f_mm_thread = ct.ResultThread(
-                    target=self.zoom_lens.set_focal_length_mm,
-                    args=(self.zoom_lens_f_mm,)).start()
+                set_zoom_lens_f_mm_future = self._hw_pool.submit(
+                    self.zoom_lens.set_focal_length_mm, self.zoom_lens_f_mm)
             if emission_filter is not None:
                 self.filter_wheel.move(
                     emission_filter_options[emission_filter], block=False)
@@ -797,9 +889,11 @@ class Microscope:
                 self.camera._set_exposure_time_us(int(
                     self.illumination_time_us + self.camera.rolling_time_us))
                 self.camera._arm(self.camera._num_buffers)
+                # Timing information for '_calculate_voltages':
+                self._frame_timing_px = self._calculate_frame_timing_px()
             if timestamp_mode is not None:
                 self.camera._set_timestamp_mode(timestamp_mode)
-            check_write_voltages_thread = False
+            check_write_voltages_future = False
             if (projection_mode is not None or
                 projection_angle_deg is not None or
                 channels_per_slice is not None or
@@ -826,10 +920,9 @@ class Microscope:
                 self.camera.num_images = ( # update attribute
                     self.images + self.camera_preframes)
                 self.voltages = self._calculate_voltages()
-                write_voltages_thread = ct.ResultThread(
-                    target=self.ao._write_voltages,
-                    args=(self.voltages,)).start()
-                check_write_voltages_thread = True
+                write_voltages_future = self._hw_pool.submit(
+                    self.ao._write_voltages, self.voltages)
+                check_write_voltages_future = True
             # Finalize hardware commands, fastest to slowest:
             if focus_piezo_z_um is not None:
                 self.focus_piezo._finish_moving()
@@ -837,20 +930,21 @@ class Microscope:
             if emission_filter is not None:
                 self.filter_wheel._finish_moving()
             if sample_ri is not None:
-                set_zoom_lens_f_mm_thread.get_result()
+                set_zoom_lens_f_mm_future.result()
             if XY_stage_position_mm is not None:
                 self.XY_stage._finish_moving()
                 self.XY_stage_position_mm = self.XY_stage.x, self.XY_stage.y
             else:
-                update_XY_stage_position_thread.get_result()
+                update_XY_stage_position_future.result()
                 self.XY_stage_position_mm = self.XY_stage.x, self.XY_stage.y
-            if check_write_voltages_thread:
-                write_voltages_thread.get_result()
+            if check_write_voltages_future:
+                write_voltages_future.result()
             self._settings_applied = True
+            if settings_changed: self._notify_settings_changed()
             custody.switch_from(self.camera, to=None) # Release camera
         settings_thread = ct.CustodyThread(
             target=settings_task, first_resource=self.camera).start()
-        self.unfinished_tasks.put(settings_thread)
+        self.unfinished_tasks.append(settings_thread)
         return settings_thread
 
     def acquire(self,               # 'tzcyx' format
@@ -886,13 +980,13 @@ class Microscope:
             # no thread (blocking) so metatdata in _prepare_to_save is current
             self.XY_stage_position_mm = self.XY_stage.get_position_mm()
             if filename is not None:
-                prepare_to_save_thread = ct.ResultThread(
-                    target=self._prepare_to_save,
-                    args=(filename,
-                          folder_name,
-                          description,
-                          display,
-                          preview_only)).start()
+                prepare_to_save_future = self._hw_pool.submit(
+                    self._prepare_to_save,
+                    filename,
+                    folder_name,
+                    description,
+                    display,
+                    preview_only)
             # We have custody of the camera so attribute access is safe:
             pm   = self.projection_mode
             pa   = self.projection_angle_deg
@@ -930,6 +1024,7 @@ class Microscope:
             camera_thread.get_result()
             custody.switch_from(self.camera, to=self.datapreview)
             # Acquisition is 3D, but display and filesaving are 5D:
+            camera_buffer = data_buffer # keep whole buffer for re-use
             data_buffer = data_buffer[ # ditch preframes
                 self.camera_preframes:, :, :].reshape(vo, sl, ch, h_px, w_px)
             preview_buffer = self._get_preview_buffer(
@@ -937,37 +1032,40 @@ class Microscope:
             self.datapreview.get(
                 data_buffer, pm, pa, s_um, s_px, l_px, c_px, ts,
                 allocated_memory=preview_buffer)
+            resource = self.datapreview # current custody
             if display:
-                custody.switch_from(self.datapreview, to=self.display)
+                custody.switch_from(resource, to=self.display)
+                resource = self.display
                 self.display.show_image(preview_buffer)
-                custody.switch_from(self.display, to=None)
-            else:
-                custody.switch_from(self.datapreview, to=None)
+                self._set_displayed_preview(preview_buffer)
             if filename is not None:
-                data_path, preview_path = prepare_to_save_thread.get_result()
+                data_path, preview_path = prepare_to_save_future.result()
+                custody.switch_from(resource, to=self.filesaving)
+                resource = self.filesaving
                 if self.verbose:
                     print("%s: saving '%s'"%(self.name, data_path))
                     print("%s: saving '%s'"%(self.name, preview_path))
-                # TODO: consider puting FileSaving in a SubProcess
+                # Save in a subprocess (avoids the GIL of this process):
                 if not preview_only:
-                    imwrite(data_path, data_buffer, imagej=True)
-                imwrite(preview_path, preview_buffer, imagej=True)
+                    self.filesaving.save(data_path, data_buffer)
+                self.filesaving.save(preview_path, preview_buffer)
                 if self.verbose:
                     print("%s: done saving."%self.name)
-            self._release_data_buffer(data_buffer)
+            custody.switch_from(resource, to=None)
+            self._release_data_buffer(camera_buffer)
             self._release_preview_buffer(preview_buffer)
             del preview_buffer
         acquire_thread = ct.CustodyThread(
             target=acquire_task, first_resource=self.camera).start()
-        self.unfinished_tasks.put(acquire_thread)
+        self.unfinished_tasks.append(acquire_thread)
         return acquire_thread
 
     def finish_all_tasks(self):
         collected_tasks = []
         while True:
             try:
-                th = self.unfinished_tasks.get_nowait()
-            except queue.Empty:
+                th = self.unfinished_tasks.popleft()
+            except IndexError:
                 break
             th.get_result()
             collected_tasks.append(th)
@@ -988,7 +1086,9 @@ class Microscope:
         self.XY_stage.close()
         self.Z_stage.close()
         self.Z_drive.close()
-        self.display.close()
+        self._hw_pool.shutdown()
+        if self._display is not None: # only close if opened
+            self._display.close()
         if self.verbose: print("%s: done closing."%self.name)
 
 class _CustomNapariDisplay:
@@ -1031,6 +1131,10 @@ class _CustomNapariDisplay:
     def close(self):
         self.viewer.close()
 
+class _FileSaving:
+    def save(self, path, image): # 'image' can be a ct.SharedNDArray
+        imwrite(path, image, imagej=True)
+
 # HT SOLS definitions and API:
 
 # The chosen API (exposed via '.apply_settings()') forces the user to
@@ -1042,7 +1146,7 @@ class _CustomNapariDisplay:
 # and 'scan_range_um' attributes after the last call to '.apply_settings()'.
 
 def calculate_scan_step_size_um(sample_px_um, scan_step_size_px):
-    return scan_step_size_px * sample_px_um / np.cos(tilt)
+    return scan_step_size_px * sample_px_um / cos_tilt
 
 def calculate_scan_range_um(sample_px_um, scan_step_size_px, slices_per_volume):
     scan_step_size_um = calculate_scan_step_size_um(
@@ -1050,11 +1154,11 @@ def calculate_scan_range_um(sample_px_um, scan_step_size_px, slices_per_volume):
     return scan_step_size_um * (slices_per_volume - 1)
 
 def calculate_voxel_aspect_ratio(scan_step_size_px):
-    return scan_step_size_px * np.tan(tilt)
+    return scan_step_size_px * tan_tilt
 
 def calculate_cuboid_voxel_scan(
     sample_px_um, voxel_aspect_ratio, scan_range_um):
-    scan_step_size_px = max(int(round(voxel_aspect_ratio / np.tan(tilt))), 1)
+    scan_step_size_px = max(int(round(voxel_aspect_ratio / tan_tilt)), 1)
     scan_step_size_um = calculate_scan_step_size_um(
         sample_px_um, scan_step_size_px)
     slices_per_volume = 1 + int(round(scan_range_um / scan_step_size_um))
@@ -1064,6 +1168,35 @@ class DataPreview:
     # Returns 3 max intensity projections along the traditional XYZ axes. For
     # speed (and simplicity) these are calculated to the nearest pixel (without
     # interpolation) and should propably not be used for rigorous analysis.
+    def __init__(self, max_workers=None):
+        # Persistent pool (no thread churn per call), numpy releases the GIL:
+        self._pool = ThreadPoolExecutor(max_workers or os.cpu_count())
+        self._scratch = threading.local() # buffers re-used by each thread
+
+    def _get_scratch(self, name, shape): # zeroed, re-used if shape matches
+        buffer = getattr(self._scratch, name, None)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.zeros(shape, 'uint16')
+            setattr(self._scratch, name, buffer)
+        else:
+            buffer.fill(0)
+        return buffer
+
+    @staticmethod
+    def _zoom_nearest(image, factors): # integer factors -> np.repeat (fast)
+        zoom_factors = []
+        for axis, factor in enumerate(factors):
+            repeats = int(round(factor))
+            if repeats >= 1 and abs(factor - repeats) < 1e-9:
+                if repeats > 1:
+                    image = np.repeat(image, repeats, axis=axis)
+                zoom_factors.append(1)
+            else:
+                zoom_factors.append(factor)
+        if any(factor != 1 for factor in zoom_factors): # order=0 -> nearest
+            image = zoom(image, zoom_factors, order=0, mode='nearest')
+        return image
+
     @staticmethod
     def shape(projection_mode,
               projection_angle_deg,
@@ -1081,7 +1214,7 @@ class DataPreview:
         scan_step_size_um = calculate_scan_step_size_um(
             sample_px_um, scan_step_size_px)
         prop_px_per_scan_step = scan_step_size_um / ( # for an O1 axis view
-            sample_px_um * np.cos(tilt))
+            sample_px_um * cos_tilt)
         prop_px_shear_max = int(np.rint(
             prop_px_per_scan_step * (slices_per_volume - 1)))
         # Get image size with projections:
@@ -1097,8 +1230,8 @@ class DataPreview:
                      y_px,
                      x_px)
         else:
-            y_px = int(round((h_px + prop_px_shear_max) * np.cos(tilt)))
-            z_px = int(round(h_px * np.sin(tilt)))
+            y_px = int(round((h_px + prop_px_shear_max) * cos_tilt))
+            z_px = int(round(h_px * sin_tilt))
             shape = (volumes_per_buffer,
                      num_channels_per_slice,
                      y_px + z_px + 2 * preview_line_px,
@@ -1137,76 +1270,80 @@ class DataPreview:
         # Calculate max px shear on the propagation axis for an 'O1' projection:
         # -> more shear than for a 'native' projection
         prop_px_per_scan_step = scan_step_size_um / ( # O1 axis view
-            sample_px_um * np.cos(tilt))
+            sample_px_um * cos_tilt)
         prop_px_shear_max = int(np.rint(prop_px_per_scan_step * (slices - 1)))
+        prop_px_shears = np.rint( # shear of every slice
+            np.arange(slices) * prop_px_per_scan_step).astype(int)
         # Calculate max px shear on the scan axis for a 'width' projection:
         scan_steps_per_prop_px = 1 / prop_px_per_scan_step  # width axis view
         scan_px_shear_max = int(np.rint(scan_steps_per_prop_px * (prop_px - 1)))
-        # Make projections:
-        for v in range(vo):
-            for c in range(ch):
-                if projection_mode:
-                    # Scale images according to pixel size (divide by X_px_um):
-                    X_px_um = sample_px_um # width axis
-                    Z_px_um = sample_px_um * np.sin( # prop. to O1 axis
-                        tilt + np.deg2rad(pa))
-                    img = data[v, 0, c, :, :] # 1 slice
-                    proj_img  = zoom(
-                        img, (Z_px_um / X_px_um, 1), mode='nearest')
-                    # Make image with projection and flip for trad. view:
-                    allocated_memory[v, c, :, :] = proj_img
-                else:
-                    O1_proj = np.zeros(
-                        (prop_px + prop_px_shear_max, w_px), 'uint16')
-                    width_proj = np.zeros(
-                        (slices + scan_px_shear_max, prop_px), 'uint16')
-                    max_width = np.amax(data[v, :, c, :, :], axis=2)
-                    scan_proj = np.amax(data[v, :, c, :, :], axis=0)
-                    for i in range(slices):
-                        prop_px_shear = int(np.rint(i * prop_px_per_scan_step))
-                        target = O1_proj[
-                            prop_px_shear:prop_px + prop_px_shear, :]
-                        np.maximum(target, data[v, i, c, :, :], out=target)
-                    for i in range(prop_px):
-                        scan_px_shear = int(np.rint(i * scan_steps_per_prop_px))
-                        width_proj[scan_px_shear:slices + scan_px_shear, i] = (
-                            max_width[:, i])
-                    # Scale images according to pixel size (divide by X_px_um):
-                    X_px_um = sample_px_um # width axis
-                    Y_px_um = sample_px_um * np.cos(tilt) # prop. to scan axis
-                    Z_px_um = sample_px_um * np.sin(tilt) # prop. to O1 axis
-                    O1_img    = zoom(
-                        O1_proj, (Y_px_um / X_px_um, 1), mode='nearest')
-                    scan_img  = zoom(
-                        scan_proj, (Z_px_um / X_px_um, 1), mode='nearest')
-                    scan_scale = O1_img.shape[0] / width_proj.shape[0]
-                    # = scan_step_size_um / X_px_um rounded to = O1_img.shape[0]
-                    width_img = zoom(width_proj,
-                                     (scan_scale, Z_px_um / X_px_um),
-                                     mode='nearest')
-                    # Make image with all projections and flip for trad. view:
-                    y_px, x_px = O1_img.shape
-                    line_min, line_max = O1_img.min(), O1_img.max()
-                    # Pass projections into allocated memory:
-                    m = allocated_memory # keep code short!
-                    m[v, c, l_px:y_px + l_px, l_px:x_px + l_px] = np.flip(
-                        O1_img)
-                    m[v, c, y_px + 2*l_px:, l_px:x_px + l_px] = np.flip(
-                        scan_img)
-                    m[v, c, l_px:y_px + l_px, x_px + 2*l_px:] = np.flip(
-                        width_img)
-                    m[v, c, y_px + 2*l_px:, x_px + 2*l_px:] = np.full(
-                        (scan_img.shape[0], width_img.shape[1]), 0)
-                    # Add line separations between projections:
-                    m[v, c, :l_px,    :] = line_max
-                    m[v, c, :l_px, ::10] = line_min
-                    m[v, c, y_px + l_px:y_px + 2*l_px,    :] = line_max
-                    m[v, c, y_px + l_px:y_px + 2*l_px, ::10] = line_min
-                    m[v, c, :,    :l_px] = line_max
-                    m[v, c, ::10, :l_px] = line_min
-                    m[v, c, :,    x_px + l_px:x_px + 2*l_px] = line_max
-                    m[v, c, ::10, x_px + l_px:x_px + 2*l_px] = line_min
-                    m[v, c, :] = np.flipud(m[v, c, :])
+        # Sheared (row, column) target of every 'max_width' pixel:
+        scan_px_shears = np.rint(
+            np.arange(prop_px) * scan_steps_per_prop_px).astype(int)
+        width_rows = scan_px_shears + np.arange(slices)[:, np.newaxis]
+        width_cols = np.arange(prop_px)
+        # Make projections (1 job per volume and channel):
+        def _project(v, c):
+            if projection_mode:
+                # Scale images according to pixel size (divide by X_px_um):
+                X_px_um = sample_px_um # width axis
+                Z_px_um = sample_px_um * np.sin( # prop. to O1 axis
+                    tilt + np.deg2rad(pa))
+                img = data[v, 0, c, :, :] # 1 slice
+                proj_img  = self._zoom_nearest(img, (Z_px_um / X_px_um, 1))
+                # Make image with projection and flip for trad. view:
+                allocated_memory[v, c, :, :] = proj_img
+            else:
+                O1_proj = self._get_scratch(
+                    'O1_proj', (prop_px + prop_px_shear_max, w_px))
+                width_proj = self._get_scratch(
+                    'width_proj', (slices + scan_px_shear_max, prop_px))
+                # 1 pass over the slices for all 3 projections:
+                # -> each slice is read while still in cache
+                max_width = np.empty((slices, prop_px), 'uint16')
+                scan_proj = self._get_scratch('scan_proj', (prop_px, w_px))
+                for i in range(slices):
+                    slice_i = data[v, i, c, :, :]
+                    np.amax(slice_i, axis=1, out=max_width[i])
+                    np.maximum(scan_proj, slice_i, out=scan_proj)
+                    prop_px_shear = prop_px_shears[i]
+                    target = O1_proj[
+                        prop_px_shear:prop_px + prop_px_shear, :]
+                    np.maximum(target, slice_i, out=target)
+                width_proj[width_rows, width_cols] = max_width # 1 scatter
+                # Scale images according to pixel size (divide by X_px_um):
+                X_px_um = sample_px_um # width axis
+                Y_px_um = sample_px_um * cos_tilt # prop. to scan axis
+                Z_px_um = sample_px_um * sin_tilt # prop. to O1 axis
+                O1_img    = self._zoom_nearest(O1_proj, (Y_px_um / X_px_um, 1))
+                scan_img  = self._zoom_nearest(
+                    scan_proj, (Z_px_um / X_px_um, 1))
+                scan_scale = O1_img.shape[0] / width_proj.shape[0]
+                # = scan_step_size_um / X_px_um rounded to = O1_img.shape[0]
+                width_img = self._zoom_nearest(
+                    width_proj, (scan_scale, Z_px_um / X_px_um))
+                # Make image with all projections and flip for trad. view:
+                y_px, x_px = O1_img.shape
+                line_min, line_max = O1_img.min(), O1_img.max()
+                # Pass projections into allocated memory (flipped view):
+                m = allocated_memory[v, c, ::-1, :] # no flipud copy needed
+                m[l_px:y_px + l_px, l_px:x_px + l_px] = np.flip(O1_img)
+                m[y_px + 2*l_px:,   l_px:x_px + l_px] = np.flip(scan_img)
+                m[l_px:y_px + l_px, x_px + 2*l_px:]   = np.flip(width_img)
+                m[y_px + 2*l_px:,   x_px + 2*l_px:]   = 0
+                # Add line separations between projections:
+                m[:l_px,    :] = line_max
+                m[:l_px, ::10] = line_min
+                m[y_px + l_px:y_px + 2*l_px,    :] = line_max
+                m[y_px + l_px:y_px + 2*l_px, ::10] = line_min
+                m[:,    :l_px] = line_max
+                m[::10, :l_px] = line_min
+                m[:,    x_px + l_px:x_px + 2*l_px] = line_max
+                m[::10, x_px + l_px:x_px + 2*l_px] = line_min
+        futures = [self._pool.submit(_project, v, c)
+                   for v in range(vo) for c in range(ch)]
+        for future in futures:
+            future.result() # wait for all and raise any errors
         return return_value
 
 class DataZ:
@@ -1230,7 +1367,7 @@ class DataZ:
         t_px, b_px = 2 * (preview_crop_px,) # crop top and bottom pixel rows
         if timestamp_mode == "binary+ASCII": t_px = 8 # ignore timestamps
         h_px = height_px - t_px - b_px
-        z_px = int(round(h_px * np.sin(tilt))) # DataPreview definition
+        z_px = int(round(h_px * sin_tilt)) # DataPreview definition
         inspect_me = preview_image[:z_px, preview_line_px:width_px]
         intensity_line = np.average(inspect_me, axis=1)[::-1] # O1 -> coverslip
         intensity_line_smooth = gaussian_filter1d(
@@ -1238,10 +1375,7 @@ class DataZ:
         if method == 'max_intensity':
             max_z_intensity_um = np.argmax(intensity_line_smooth) * sample_px_um
             return max_z_intensity_um
-        intensity_gradient = np.zeros((len(intensity_line_smooth) - 1))
-        for px in range(len(intensity_line_smooth) - 1):
-            intensity_gradient[px] = (
-                intensity_line_smooth[px + 1] - intensity_line_smooth[px])
+        intensity_gradient = np.diff(intensity_line_smooth) # px+1 - px
         max_z_gradient_um = np.argmax(intensity_gradient) * sample_px_um
         return max_z_gradient_um
 
@@ -1262,15 +1396,19 @@ class DataRoi:
         vo, slices, ch, h_px, w_px = data.shape
         t_px, b_px = 2 * (preview_crop_px,) # crop top and bottom pixel rows
         if timestamp_mode == "binary+ASCII": t_px = 8 # ignore timestamps
-        min_index_vo, max_index_vo = [], []
+        # Roi per volume and channel, defaults to the whole volume:
+        min_index = np.zeros((vo, ch, 3), 'int64')
+        max_index = np.empty((vo, ch, 3), 'int64')
+        max_index[:] = (slices - 1, h_px - 1, w_px - 1)
         for v in range(vo):
-            min_index_ch, max_index_ch = [], []
             for c in range(ch):
-                # Max project volume to images:
-                width_projection = np.amax(
-                    data[v, :, c, t_px:h_px - b_px, :], axis=2)
-                scan_projection  = np.amax(
-                    data[v, :, c, t_px:h_px - b_px, :], axis=0)
+                # Max project volume to images (1 pass over the slices):
+                volume = data[v, :, c, t_px:h_px - b_px, :]
+                width_projection = np.empty(volume.shape[:2], volume.dtype)
+                scan_projection  = volume[0].copy()
+                for i in range(slices):
+                    np.amax(volume[i], axis=1, out=width_projection[i])
+                    np.maximum(scan_projection, volume[i], out=scan_projection)
                 # Max project images to lines and smooth to reject hot pixels:
                 scan_line  = gaussian_filter1d(
                     np.max(width_projection, axis=1), gaussian_filter_std)
@@ -1282,39 +1420,20 @@ class DataRoi:
                 scan_threshold  = int(min(scan_line)  * signal_to_bg_ratio)
                 prop_threshold  = int(min(prop_line)  * signal_to_bg_ratio)
                 width_threshold = int(min(width_line) * signal_to_bg_ratio)
-                # Estimate roi:.
-                min_index_zyx = [0, 0, 0]
-                max_index_zyx = [slices - 1, h_px - 1, w_px - 1]
-                for i in range(slices):
-                    if scan_line[i]  > scan_threshold:
-                        min_index_zyx[0] = i
-                        break
-                for i in range(h_px - t_px - b_px):
-                    if prop_line[i]  > prop_threshold:
-                        min_index_zyx[1] = i + t_px # put cropped pixels back
-                        break
-                for i in range(w_px):
-                    if width_line[i] > width_threshold:
-                        min_index_zyx[2] = i
-                        break        
-                for i in range(slices):
-                    if scan_line[-i] > scan_threshold:
-                        max_index_zyx[0] = max_index_zyx[0] - i
-                        break
-                for i in range(h_px - t_px - b_px):
-                    if prop_line[-i] > prop_threshold:
-                        max_index_zyx[1] = max_index_zyx[1] - i - b_px
-                        break
-                for i in range(w_px):
-                    if width_line[-i] > width_threshold:
-                        max_index_zyx[2] = max_index_zyx[2] - i
-                        break
-                min_index_ch.append(min_index_zyx)
-                max_index_ch.append(max_index_zyx)
-            min_index_vo.append(np.amin(min_index_ch, axis=0))
-            max_index_vo.append(np.amax(max_index_ch, axis=0))
-        min_i = np.amin(min_index_vo, axis=0)
-        max_i = np.amax(max_index_vo, axis=0)
+                # Estimate roi (first and last px above threshold):
+                min_index_zyx, max_index_zyx = min_index[v, c], max_index[v, c]
+                lines = (scan_line, prop_line, width_line)
+                thresholds = (scan_threshold, prop_threshold, width_threshold)
+                t_crop, b_crop = (0, t_px, 0), (0, b_px, 0) # put cropped back
+                for i, (line, threshold) in enumerate(zip(lines, thresholds)):
+                    above = np.flatnonzero(line > threshold) # 1 pass
+                    if not above.size:
+                        continue
+                    min_index_zyx[i] = int(above[0]) + t_crop[i]
+                    max_index_zyx[i] -= ( # -1 fencepost kept from loops
+                        len(line) - int(above[-1]) + b_crop[i])
+        min_i = np.amin(min_index, axis=(0, 1)) # union of all rois
+        max_i = np.amax(max_index, axis=(0, 1))
         data_roi = data[
             :, min_i[0]:max_i[0], :, min_i[1]:max_i[1], min_i[2]:max_i[2]]
         return data_roi # hopefully smaller!
@@ -1324,45 +1443,133 @@ class DataNative:
     # If 'type(scan_step_size_px) is int' (default) then no interpolation is
     # needed to view the volume. The native view looks at the sample with
     # the 'tilt' of the Snouty objective (microsope 3 in the emmission path).
+    @staticmethod
+    def shape(volumes_per_buffer,
+              slices_per_volume,
+              num_channels_per_slice, # = len(channels_per_slice)
+              height_px,
+              width_px,
+              scan_step_size_px):
+        prop_px = height_px # light-sheet propagation axis
+        scan_step_px_max = int(np.rint(
+            scan_step_size_px * (slices_per_volume - 1)))
+        shape = (volumes_per_buffer,
+                 slices_per_volume,
+                 num_channels_per_slice,
+                 prop_px + scan_step_px_max,
+                 width_px)
+        return shape
+
     def get(
         self,
         data, # raw 5D data, 'tzcyx' input -> 'tzcyx' output
-        scan_step_size_px):
+        scan_step_size_px,
+        allocated_memory=None):
         vo, slices, ch, h_px, w_px = data.shape
         prop_px = h_px # light-sheet propagation axis
-        scan_step_px_max = int(np.rint(scan_step_size_px * (slices - 1)))
-        data_native = np.zeros(
-            (vo, slices, ch, prop_px + scan_step_px_max, w_px), 'uint16')
-        for v in range(vo):
-            for c in range(ch):
-                for i in range(slices):
-                    prop_px_shear = int(np.rint(i * scan_step_size_px))
-                    data_native[
-                        v, i, c, prop_px_shear:prop_px + prop_px_shear, :] = (
-                            data[v, i, c, :, :])
-        return data_native # larger!
+        # Get native shape and check allocated memory (or make new array):
+        native_shape = self.shape(vo, slices, ch, h_px, w_px, scan_step_size_px)
+        if native_shape == data.shape and allocated_memory is None: # no shear
+            return data # (e.g. 1 slice) -> raw data = native view (no copy!)
+        if allocated_memory is not None: # e.g. re-use for a series of files
+            assert allocated_memory.shape == native_shape
+            data_native = allocated_memory
+            return_value = None # use given memory and avoid return
+        else: # make new array and return
+            data_native = np.zeros(native_shape, 'uint16')
+            return_value = data_native # larger!
+        # Slices that share a shear are copied together (all 'v' and 'c'):
+        prop_px_shears = np.rint(
+            np.arange(slices) * scan_step_size_px).astype(int)
+        first_slices = np.flatnonzero(np.diff(prop_px_shears, prepend=-1))
+        for i0, i1 in zip(first_slices, (*first_slices[1:], slices)):
+            prop_px_shear = prop_px_shears[i0]
+            if return_value is None: # clear old data outside shear
+                data_native[:, i0:i1, :, :prop_px_shear, :] = 0
+                data_native[:, i0:i1, :, prop_px + prop_px_shear:, :] = 0
+            data_native[
+                :, i0:i1, :, prop_px_shear:prop_px + prop_px_shear, :] = (
+                    data[:, i0:i1, :, :, :])
+        return return_value
 
 class DataTraditional:
     # Very slow but pleasing - rotates the native view to the traditional view!
+    # -> the zoom (to cubic voxels) and rotation are fused into 1 interpolation
+    def __init__(self, max_workers=None):
+        # Persistent pool, scipy.ndimage interpolation releases the GIL:
+        self._max_workers = max_workers or os.cpu_count()
+        self._pool = ThreadPoolExecutor(self._max_workers)
+
+    @staticmethod
+    def shape(volumes_per_buffer,
+              slices_per_volume,
+              num_channels_per_slice, # = len(channels_per_slice)
+              height_px, # native view height (i.e. 'DataNative.shape')
+              width_px,
+              scan_step_size_px):
+        if slices_per_volume == 1: # e.g. projection mode -> no volume to rotate
+            return (volumes_per_buffer,
+                    slices_per_volume,
+                    num_channels_per_slice,
+                    height_px,
+                    width_px)
+        voxel_aspect_ratio = calculate_voxel_aspect_ratio(scan_step_size_px)
+        # Cubic voxel 'z' px (as 'zoom') and traditional 'zy' px (as 'rotate'):
+        z_px = int(round(slices_per_volume * voxel_aspect_ratio))
+        bounds = np.array(((cos_tilt, sin_tilt), (-sin_tilt, cos_tilt))) @ (
+            (0, 0, z_px, z_px), (0, height_px, 0, height_px))
+        zy_px = (np.ptp(bounds, axis=1) + 0.5).astype(int)
+        shape = (volumes_per_buffer,
+                 int(zy_px[0]),
+                 num_channels_per_slice,
+                 int(zy_px[1]),
+                 width_px)
+        return shape
+
     def get(
         self,
         data_native, # raw 5D data, 'tzcyx' input -> 'tzcyx' output
-        scan_step_size_px):
+        scan_step_size_px,
+        allocated_memory=None, # e.g. a 'tifffile.memmap' (saves RAM)
+        order=3): # spline order, 1 = linear (faster, less accurate)
         vo, slices, ch, h_px, w_px = data_native.shape
+        # Get traditional shape and check allocated memory (or make new array):
+        traditional_shape = self.shape(
+            vo, slices, ch, h_px, w_px, scan_step_size_px)
+        if allocated_memory is not None: # e.g. re-use for a series of files
+            assert allocated_memory.shape == traditional_shape
+            data_traditional = allocated_memory
+            return_value = None # use given memory and avoid return
+        elif slices == 1: # 1 slice (e.g. projection mode) is already 'flat'
+            return data_native
+        else: # every px is written, so no need to zero (or concatenate):
+            data_traditional = np.empty(traditional_shape, data_native.dtype)
+            return_value = data_traditional # even larger!
+        if slices == 1: # copy to the given memory unchanged
+            data_traditional[:] = data_native
+            return return_value
         voxel_aspect_ratio = calculate_voxel_aspect_ratio(scan_step_size_px)
-        tzcyx = []
-        for v in range(vo):
-            zcyx = []
-            for c in range(ch):
-                zyx_native_cubic_voxels = zoom(
-                    data_native[v, :, c, :, :], (voxel_aspect_ratio, 1, 1))
-                zyx_traditional = rotate(
-                    zyx_native_cubic_voxels, np.rad2deg(tilt))
-                zcyx.append(zyx_traditional[:, np.newaxis, : ,:])
-            zcyx = np.concatenate(zcyx, axis=1)
-            tzcyx.append(zcyx[np.newaxis, :, :, : ,:])
-        data_traditional = np.concatenate(tzcyx, axis=0)
-        return data_traditional # even larger!
+        z_px = int(round(slices * voxel_aspect_ratio)) # cubic voxels
+        zy_px = np.array(traditional_shape[1:4:2]) # traditional view
+        rotation = np.array(((cos_tilt, sin_tilt), (-sin_tilt, cos_tilt)))
+        offset = (np.array((z_px, h_px)) - 1) / 2 - rotation @ ((zy_px - 1) / 2)
+        # Map traditional -> cubic voxel -> native coordinates in 1 step:
+        z_scale = (slices - 1) / (z_px - 1) if z_px != 1 else 1
+        matrix = np.diag((z_scale, 1)) @ rotation
+        offset = offset * (z_scale, 1)
+        def _transform(v, c, x_planes): # 1 'zy' plane per width px
+            for x in x_planes:
+                affine_transform(
+                    data_native[v, :, c, :, x], matrix, offset,
+                    output=data_traditional[v, :, c, :, x], order=order)
+        # Split each volume and channel into blocks of planes for the pool:
+        x_blocks = np.array_split(np.arange(w_px), self._max_workers)
+        futures = [self._pool.submit(_transform, v, c, x_planes)
+                   for v in range(vo) for c in range(ch)
+                   for x_planes in x_blocks if len(x_planes)]
+        for future in futures:
+            future.result() # wait for all and raise any errors
+        return return_value
 
 if __name__ == '__main__':
     t0 = time.perf_counter()
@@ -2,7 +2,7 @@ import time
 import os
 import numpy as np
 from datetime import datetime
-from tifffile import imread, imwrite
+from tifffile import imwrite, memmap
 
 import ht_sols_microscope as ht_sols
 
@@ -154,8 +154,9 @@ if __name__ == '__main__': # required block for sols_microscope
             # run autofocus routine:
             scope.finish_all_tasks() # must finish before looking at preview!
             autofocus_filename = filename488 # which filename for autofocus?
-            preview = imread( # 1 2D image from preview! (1 vol, 1 ch)
-                folder_name + '\preview\\' + autofocus_filename)
+            preview = memmap( # 1 2D image from preview! (1 vol, 1 ch)
+                os.path.join(folder_name, 'preview', autofocus_filename),
+                mode='r') # read only the rows that 'dataz' inspects
             z_um = dataz.estimate(preview, # parameters must match preview file!
                                   scope.height_px,
                                   scope.width_px,
@@ -1,7 +1,11 @@
 # Imports from the python standard library:
 import os
+import queue
+import threading
 import time
 import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from idlelib.tooltip import Hovertip
 from tkinter import filedialog
@@ -25,6 +29,11 @@ class GuiMicroscope:
         font.nametofont("TkDefaultFont").configure(size=size)
         font.nametofont("TkFixedFont").configure(size=size)
         font.nametofont("TkTextFont").configure(size=size)
+        # collect settings from fast GUI events (e.g. sliders) and apply once:
+        self._pending_settings, self._pending_snap = {}, False
+        self._apply_after_id = None
+        self._last_channel_settings = None
+        self._snap_requested = False # see '_request_snap'
         # load hardware GUI's:
         self.init_transmitted_light()
         self.init_laser_box()
@@ -55,6 +64,14 @@ class GuiMicroscope:
                 ao_rate=1e4,
                 print_warnings=False)
             self.max_bytes_per_buffer = self.scope.max_bytes_per_buffer
+            # the scope sends a status dict when settings change (from its
+            # settings thread, so only queue it here and update tk vars later):
+            self._new_status = queue.SimpleQueue()
+            self.scope.on_settings_changed = self._new_status.put
+            # snaps wait for the last acquire off the tk thread (1 worker):
+            self._snap_pool = ThreadPoolExecutor(max_workers=1)
+            self._snap_lock = threading.Lock()
+            self._snap_running, self._snap_pending = False, False
             # configure any hardware preferences:
             self.scope.XY_stage.set_velocity(5, 5)
             # make mandatory call to 'apply_settings':
@@ -81,27 +98,24 @@ class GuiMicroscope:
                 int(round(self.scope.focus_piezo_z_um)))
             self._update_XY_stage_position(
                 self.scope.XY_stage_position_mm)
-            # check microscope periodically:
-            def _run_check_microscope():
-                self.scope.apply_settings().get_result() # update attributes
-                self.sample_px_um = self.scope.sample_px_um
-                # check memory:
-                self.data_bytes.set(self.scope.bytes_per_data_buffer)
-                self.data_buffer_exceeded.set(self.scope.data_buffer_exceeded)
-                self.preview_bytes.set(self.scope.bytes_per_preview_buffer)
-                self.preview_buffer_exceeded.set(
-                    self.scope.preview_buffer_exceeded)
-                self.total_bytes.set(self.scope.total_bytes)
-                self.total_bytes_exceeded.set(self.scope.total_bytes_exceeded)
-                # calculate voltages:
-                self.buffer_time_s.set(self.scope.buffer_time_s)
-                self.volumes_per_s.set(self.scope.volumes_per_s)
+            # check inputs periodically (status vars only if changed):
+            self._update_position_task = None
+            def _run_check_inputs():
+                # update XY position (don't wait, don't queue more than 1):
+                if (self._update_position_task is None or
+                    not self._update_position_task.is_alive()):
+                    self._update_position_task = self.scope.apply_settings()
+                status = None
+                while not self._new_status.empty(): # keep the latest
+                    status = self._new_status.get()
+                if status is not None:
+                    self._refresh_status_vars(status)
                 # check autofocus and joystick:
                 self._check_autofocus()
                 self._check_joystick()
-                self.root.after(int(1e3/10), _run_check_microscope) # 10fps
+                self.root.after(int(1e3/10), _run_check_inputs) # 10fps
                 return None
-            _run_check_microscope()
+            _run_check_inputs()
             # run snoutfocus periodically:
             def _run_snoutfocus():
                 if not self.running_acquire.get():
@@ -113,20 +127,47 @@ class GuiMicroscope:
             self.scope.snoutfocus_piezo.set_voltage(75/2)
             # make session folder:
             dt = datetime.strftime(datetime.now(),'%Y-%m-%d_%H-%M-%S_')
-            self.session_folder = dt + 'ht_sols_gui_session\\'
-            os.makedirs(self.session_folder)
+            self.session_folder = dt + 'ht_sols_gui_session'
+            os.makedirs(self.session_folder, exist_ok=True)
             # snap a volume and enable scout mode:
             self.last_acquire_task = self.scope.acquire()
             self.running_scout_mode.set(True)
         # add close function + any commands for when the user hits the 'X'
         def _close():
-            if init_microscope: self.scope.close()
+            if init_microscope:
+                self._snap_pool.shutdown() # finish any snap first
+                self.scope.close()
             self.root.destroy()
             return None
         self.root.protocol("WM_DELETE_WINDOW", _close)
         # start event loop:
         self.root.mainloop() # blocks here until 'X'
 
+    def _set_if_changed(self, var, value):
+        if var.get() != value: # .set() fires traces even for the same value
+            var.set(value)
+        return None
+
+    def _refresh_status_vars(self, status):
+        self.sample_px_um = status['sample_px_um']
+        # check memory:
+        self._set_if_changed(self.data_bytes, status['bytes_per_data_buffer'])
+        self._set_if_changed(
+            self.data_buffer_exceeded, status['data_buffer_exceeded'])
+        self._set_if_changed(
+            self.preview_bytes, status['bytes_per_preview_buffer'])
+        self._set_if_changed(
+            self.preview_buffer_exceeded, status['preview_buffer_exceeded'])
+        self._set_if_changed(self.total_bytes, status['total_bytes'])
+        self._set_if_changed(
+            self.total_bytes_exceeded, status['total_bytes_exceeded'])
+        # calculate voltages: (round to display precision)
+        self._set_if_changed(
+            self.buffer_time_s, round(status['buffer_time_s'], 6))
+        self._set_if_changed(
+            self.volumes_per_s, round(status['volumes_per_s'], 3))
+        return None
+
     def init_transmitted_light(self):
         frame = tk.LabelFrame(self.root, text='TRANSMITTED LIGHT', bd=6)
         frame.grid(row=1, column=0, padx=5, pady=5, sticky='n')
@@ -207,29 +248,47 @@ class GuiMicroscope:
             'write', self._apply_channel_settings)        
         self.power_640.value.trace_add(
             'write', self._apply_channel_settings)
+        # channel names and widgets (in order) for '_apply_channel_settings':
+        self._channel_widgets = (('LED', self.power_tl),
+                                 ('405', self.power_405),
+                                 ('488', self.power_488),
+                                 ('561', self.power_561),
+                                 ('640', self.power_640))
         return None
 
     def _apply_channel_settings(self, var, index, mode):
         # var, index, mode are passed from .trace_add but not used
-        channels_per_slice, power_per_channel = [], []
-        if self.power_tl.checkbox_value.get():
-            channels_per_slice.append('LED')
-            power_per_channel.append(self.power_tl.value.get())
-        if self.power_405.checkbox_value.get():
-            channels_per_slice.append('405')
-            power_per_channel.append(self.power_405.value.get())
-        if self.power_488.checkbox_value.get():
-            channels_per_slice.append('488')
-            power_per_channel.append(self.power_488.value.get())
-        if self.power_561.checkbox_value.get():
-            channels_per_slice.append('561')
-            power_per_channel.append(self.power_561.value.get())
-        if self.power_640.checkbox_value.get():
-            channels_per_slice.append('640')
-            power_per_channel.append(self.power_640.value.get())
-        if len(channels_per_slice) > 0: # at least 1 channel selected
-            self.scope.apply_settings(channels_per_slice=channels_per_slice,
-                                      power_per_channel=power_per_channel)
+        selected = [(name, widget.value.get())
+                    for name, widget in self._channel_widgets
+                    if widget.checkbox_value.get()]
+        channel_settings = tuple(zip(*selected)) # (channels, powers) or ()
+        if channel_settings == self._last_channel_settings:
+            return None # no change (e.g. checkbox and slider traces)
+        if len(selected) > 0: # at least 1 channel selected
+            self._last_channel_settings = channel_settings
+            channels_per_slice, power_per_channel = channel_settings
+            self._schedule_apply(channels_per_slice=channels_per_slice,
+                                 power_per_channel=power_per_channel)
+        return None
+
+    def _schedule_apply(self, snap=False, **settings):
+        # GUI events only update the pending settings, then 1 call ~50ms later
+        self._pending_settings.update(settings)
+        self._pending_snap = self._pending_snap or snap
+        if self._apply_after_id is None:
+            self._apply_after_id = self.root.after(50, self._flush_apply)
+        return None
+
+    def _flush_apply(self): # also called before acquiring (apply latest)
+        if self._apply_after_id is not None:
+            self.root.after_cancel(self._apply_after_id)
+            self._apply_after_id = None
+        settings, self._pending_settings = self._pending_settings, {}
+        snap, self._pending_snap = self._pending_snap, False
+        if len(settings) > 0:
+            self.scope.apply_settings(**settings)
+        if snap and self.running_scout_mode.get():
+            self._request_snap()
         return None
 
     def init_dichroic_mirror(self):
@@ -274,7 +333,7 @@ class GuiMicroscope:
         option_menu.grid(row=0, column=0, padx=10, pady=10)
         self.emission_filter.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 emission_filter=self.emission_filter.get()))
         return None
 
@@ -300,10 +359,9 @@ class GuiMicroscope:
             row=0,
             width=5)
         def _update_focus():
-            self.scope.apply_settings(
+            self._schedule_apply(
+                snap=True, # if scout mode
                 ls_focus_adjust_v=1e-3*self.ls_focus_adjust.value.get())
-            if self.running_scout_mode.get():
-                self._snap_and_display()
             return None
         self.ls_focus_adjust.value.trace_add(
             'write',
@@ -342,10 +400,9 @@ class GuiMicroscope:
             row=2,
             width=5)
         def _update_dither():
-            self.scope.apply_settings(
+            self._schedule_apply(
+                snap=True, # if scout mode
                 ls_angular_dither_v=self.ls_angular_dither.value.get())
-            if self.running_scout_mode.get():
-                self._snap_and_display()
             return None
         self.ls_angular_dither.value.trace_add(
             'write',
@@ -408,7 +465,7 @@ class GuiMicroscope:
             sticky='w')
         self.illumination_time_us.value.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 illumination_time_us=self.illumination_time_us.value.get()))
         illumination_time_us_tip = Hovertip(
             self.illumination_time_us,
@@ -432,7 +489,7 @@ class GuiMicroscope:
             width=5)
         self.height_px.value.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 height_px=self.height_px.value.get()))
         height_px_tip = Hovertip(
             self.height_px,
@@ -456,7 +513,7 @@ class GuiMicroscope:
             width=5)
         self.width_px.value.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 width_px=self.width_px.value.get()))
         width_px_tip = Hovertip(
             self.width_px,
@@ -494,7 +551,7 @@ class GuiMicroscope:
             width=5)
         self.scan_range_um.value.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 scan_range_um=self.scan_range_um.value.get()))        
         scan_range_um_tip = Hovertip(
             self.scan_range_um,
@@ -549,7 +606,7 @@ class GuiMicroscope:
             width=5)
         self.voxel_aspect_ratio.value.trace_add(
             'write',
-            lambda var, index, mode: self.scope.apply_settings(
+            lambda var, index, mode: self._schedule_apply(
                 voxel_aspect_ratio=self.voxel_aspect_ratio.value.get()))        
         voxel_aspect_ratio_tip = Hovertip(
             self.voxel_aspect_ratio,
@@ -597,10 +654,50 @@ class GuiMicroscope:
     def _snap_and_display(self):
         if self.volumes_per_buffer.value.get() != 1:
             self.volumes_per_buffer.update_and_validate(1)
-        self.last_acquire_task.get_result() # don't accumulate
-        self.last_acquire_task = self.scope.acquire()
+        self._pending_snap = False # snapping now
+        self._flush_apply() # apply any pending settings first
+        with self._snap_lock:
+            if self._snap_running: # 1 more snap when done (latest settings)
+                self._snap_pending = True
+                return None
+            self._snap_running = True
+        snap_future = self._snap_pool.submit(self._run_snaps)
+        snap_future.add_done_callback(self._report_snap_error)
+        return None
+
+    def _report_snap_error(self, snap_future): # nobody waits on the future
+        e = snap_future.exception()
+        if e is not None:
+            print('\nGuiMicroscope: ***ERROR*** snap failed:')
+            traceback.print_exception(type(e), e, e.__traceback__)
+        return None
+
+    def _request_snap(self): # scout mode: 1 snap per idle tk loop
+        if self._snap_requested:
+            return None
+        self._snap_requested = True
+        def _do_snap():
+            self._snap_requested = False
+            self._snap_and_display()
+            return None
+        self.root.after_idle(_do_snap)
         return None
 
+    def _run_snaps(self): # runs on '_snap_pool' so the gui doesn't block
+        try:
+            while True:
+                self.last_acquire_task.get_result() # don't accumulate
+                self.last_acquire_task = self.scope.acquire()
+                with self._snap_lock:
+                    if not self._snap_pending:
+                        self._snap_running = False
+                        return None
+                    self._snap_pending = False
+        except Exception: # don't block future snaps
+            with self._snap_lock:
+                self._snap_running, self._snap_pending = False, False
+            raise
+
     def init_sample_ri(self):
         frame = tk.LabelFrame(self.root, text='SAMPLE', bd=6)
         frame.grid(row=9, column=1, padx=5, pady=5, sticky='n')
@@ -622,9 +719,9 @@ class GuiMicroscope:
             row=0,
             width=5)
         def _update_sample_ri():
-            self.scope.apply_settings(sample_ri=self.sample_ri.value.get())
-            if self.running_scout_mode.get():
-                self._snap_and_display()
+            self._schedule_apply(
+                snap=True, # if scout mode
+                sample_ri=self.sample_ri.value.get())
             return None        
         self.sample_ri.value.trace_add(
             'write',
@@ -699,7 +796,7 @@ class GuiMicroscope:
                 focus_piezo_z_um=(self.focus_piezo_z_um.value.get(),
                                   'absolute'))
             if self.running_scout_mode.get():
-                self._snap_and_display()
+                self._request_snap()
             return None
         self.focus_piezo_z_um.value.trace_add(
             'write',
@@ -920,7 +1017,7 @@ class GuiMicroscope:
         if self.autofocus_enabled.get() and self.running_scout_mode.get():
             offset = self.scope.autofocus.offset_lens_position
             if offset != self.scope.autofocus._get_offset_lens_position():
-                self._snap_and_display()
+                self._request_snap()
         return None
 
     def init_Z_stage(self):
@@ -1113,7 +1210,7 @@ class GuiMicroscope:
                 [self.X_stage_position_mm + move_mm[0],
                  self.Y_stage_position_mm + move_mm[1]])
             if self.running_scout_mode.get():
-                self._snap_and_display()
+                self._request_snap()
             return None
         # move size:
         move_pct = tkcw.CheckboxSliderSpinbox(
@@ -1190,7 +1287,7 @@ class GuiMicroscope:
             joystick_active = True
             self.last_move.set('up (+Y)')
         if (joystick_active and self.running_scout_mode.get()):
-            self._snap_and_display()
+            self._request_snap()
         if (not joystick_active and (
             XY_mm[0] != self.X_stage_position_mm or
             XY_mm[1] != self.Y_stage_position_mm)):
@@ -1218,7 +1315,7 @@ class GuiMicroscope:
             self.scope.apply_settings(
                 projection_angle_deg=self.projection_angle.value.get())
             if self.running_scout_mode.get():
-                self._snap_and_display()
+                self._request_snap()
             return None        
         self.projection_angle.value.trace_add(
             'write',
@@ -1262,14 +1359,14 @@ class GuiMicroscope:
     def _get_folder_name(self):
         dt = datetime.strftime(datetime.now(),'%Y-%m-%d_%H-%M-%S_')
         folder_index = 0
-        folder_name = (
-            self.session_folder + dt +
-            '%03i_'%folder_index + self.label_textbox.text)
+        folder_name = os.path.join(
+            self.session_folder,
+            dt + '%03i_'%folder_index + self.label_textbox.text)
         while os.path.exists(folder_name): # check before overwriting
             folder_index +=1
-            folder_name = (
-                self.session_folder + dt +
-                '%03i_'%folder_index + self.label_textbox.text)
+            folder_name = os.path.join(
+                self.session_folder,
+                dt + '%03i_'%folder_index + self.label_textbox.text)
         return folder_name
 
     def init_grid_navigator(self):
@@ -1386,8 +1483,8 @@ class GuiMicroscope:
             self.move_to_grid_location_button.config(state='disabled')
             self.start_grid_preview_button.config(state='disabled')
             # overwrite grid file:
-            with open(self.session_folder +
-                      "grid_navigator_parameters.txt", "w") as file:
+            with open(os.path.join(self.session_folder,
+                      "grid_navigator_parameters.txt"), "w") as file:
                 file.write('rows:%i'%self.grid_rows.value.get() + '\n')
                 file.write('columns:%i'%self.grid_cols.value.get() + '\n')
                 file.write('spacing_um:%i'%self.grid_um.value.get() + '\n')
@@ -1654,12 +1751,14 @@ class GuiMicroscope:
                     self._update_position_list()
                 # get image:
                 filename = name + '.tif'
+                self._flush_apply() # apply any pending settings first
                 self.scope.acquire(
                     filename=filename,
                     folder_name=folder_name,
                     description=self.description_textbox.text,
                     preview_only=preview_only).get_result()
-                grid_preview_filename = (folder_name + '\\preview\\' + filename)
+                grid_preview_filename = os.path.join(
+                    folder_name, 'preview', filename)
                 while not os.path.isfile(grid_preview_filename):
                     self.root.after(int(1e3/30)) # 30fps
                 image = imread(grid_preview_filename)
@@ -1801,12 +1900,13 @@ class GuiMicroscope:
                 if self.save_tile_data_and_position.get():
                     preview_only = False
                     self._update_position_list()
+                self._flush_apply() # apply any pending settings first
                 self.scope.acquire(
                     filename=filename,
                     folder_name=folder_name,
                     description=self.description_textbox.text,
                     preview_only=preview_only).get_result()
-                tile_filename = (folder_name + '\\preview\\' + filename)
+                tile_filename = os.path.join(folder_name, 'preview', filename)
                 while not os.path.isfile(tile_filename):
                     self.root.after(int(1e3/30)) # 30fps
                 tile = imread(tile_filename)
@@ -1932,11 +2032,9 @@ class GuiMicroscope:
                 title='Please choose a previous "metadata" file (.txt)')        
             with open(file_path, 'r') as file:
                 metadata = file.read().splitlines()
-            # format into settings and values:
-            file_settings = {}
-            for data in metadata:
-                file_settings[data.split(':')[0]] = (
-                    data.split(':')[1:][0].lstrip())
+            # format into settings and values: (split once, values keep ':')
+            file_settings = {k: v.lstrip() for k, _, v in
+                             (data.partition(':') for data in metadata)}
             # re-format strings from file settings for gui:
             channels = file_settings[
                 'channels_per_slice'].strip('(').strip(')').split(',')
@@ -2330,10 +2428,10 @@ class GuiMicroscope:
                 initialdir=os.getcwd(),
                 title='Please choose a previous "gui session" folder')
             # read files, parse into lists and update attributes:
-            focus_piezo_file_path = (
-                folder_path + '\\focus_piezo_position_list.txt')
-            XY_stage_file_path = (
-                folder_path + '\\XY_stage_position_list.txt')
+            focus_piezo_file_path = os.path.join(
+                folder_path, 'focus_piezo_position_list.txt')
+            XY_stage_file_path = os.path.join(
+                folder_path, 'XY_stage_position_list.txt')
             with open(focus_piezo_file_path, 'r') as file:
                 focus_piezo_position_list = file.read().splitlines()
             with open(XY_stage_file_path, 'r') as file:
@@ -2350,12 +2448,12 @@ class GuiMicroscope:
                 XY_stage_position_list[i] = XY_stage_position_mm
                 self.XY_stage_position_list.append(XY_stage_position_mm)
             # append positions to files:
-            with open(self.session_folder +
-                      "focus_piezo_position_list.txt", "a") as file:
+            with open(os.path.join(self.session_folder,
+                      "focus_piezo_position_list.txt"), "a") as file:
                 for i in range(len(focus_piezo_position_list)):
                     file.write(str(focus_piezo_position_list[i]) + ',\n')
-            with open(self.session_folder +
-                      "XY_stage_position_list.txt", "a") as file:
+            with open(os.path.join(self.session_folder,
+                      "XY_stage_position_list.txt"), "a") as file:
                 for i in range(len(XY_stage_position_list)):
                     file.write(str(XY_stage_position_list[i]) + ',\n')
             # update gui:
@@ -2382,11 +2480,11 @@ class GuiMicroscope:
             self.focus_piezo_position_list = []
             self.XY_stage_position_list = []
             # clear the files:
-            with open(
-                self.session_folder + "focus_piezo_position_list.txt", "w"):
+            with open(os.path.join(self.session_folder,
+                      "focus_piezo_position_list.txt"), "w"):
                 pass
-            with open(
-                self.session_folder + "XY_stage_position_list.txt", "w"):
+            with open(os.path.join(self.session_folder,
+                      "XY_stage_position_list.txt"), "w"):
                 pass
             # update gui:
             self.total_positions.update_and_validate(0)
@@ -2413,12 +2511,12 @@ class GuiMicroscope:
             self.focus_piezo_position_list.pop(i)
             self.XY_stage_position_list.pop(i)
             # update files:
-            with open(self.session_folder +
-                      "focus_piezo_position_list.txt", "w") as file:
+            with open(os.path.join(self.session_folder,
+                      "focus_piezo_position_list.txt"), "w") as file:
                 for i in range(len(self.focus_piezo_position_list)):
                     file.write(str(self.focus_piezo_position_list[i]) + ',\n')
-            with open(self.session_folder +
-                      "XY_stage_position_list.txt", "w") as file:
+            with open(os.path.join(self.session_folder,
+                      "XY_stage_position_list.txt"), "w") as file:
                 for i in range(len(self.XY_stage_position_list)):
                     file.write(str(self.XY_stage_position_list[i]) + ',\n')
             # update gui:
@@ -2574,11 +2672,11 @@ class GuiMicroscope:
         self.total_positions.update_and_validate(positions)
         self.current_position.update_and_validate(positions)
         # write to file:
-        with open(self.session_folder +
-                  "focus_piezo_position_list.txt", "a") as file:
+        with open(os.path.join(self.session_folder,
+                  "focus_piezo_position_list.txt"), "a") as file:
             file.write(str(self.focus_piezo_position_list[-1]) + ',\n')
-        with open(self.session_folder +
-                  "XY_stage_position_list.txt", "a") as file:
+        with open(os.path.join(self.session_folder,
+                  "XY_stage_position_list.txt"), "a") as file:
             file.write(str(self.XY_stage_position_list[-1]) + ',\n')
         return None
 
@@ -2662,7 +2760,7 @@ class GuiMicroscope:
         def _scout_mode():
             self._set_running_mode('scout_mode')
             if self.running_scout_mode.get():
-                self._snap_and_display()
+                self._request_snap()
             return None
         self.running_scout_mode = tk.BooleanVar()
         scout_mode_button = tk.Checkbutton(
@@ -2688,6 +2786,7 @@ class GuiMicroscope:
                 self.volumes_per_buffer.update_and_validate(1)
             self._update_position_list()
             folder_name = self._get_folder_name() + '_snap'
+            self._flush_apply() # apply any pending settings first
             self.last_acquire_task.get_result() # don't accumulate acquires
             self.scope.acquire(filename='snap.tif',
                                folder_name=folder_name,
@@ -2733,6 +2832,7 @@ class GuiMicroscope:
             def _run_acquire():
                 if not self.running_acquire.get(): # check for cancel
                     return None
+                self._flush_apply() # apply any pending settings first
                 # don't launch all tasks: either wait 1 buffer time or delay:
                 wait_ms = int(round(1e3 * self.scope.buffer_time_s))
                 # check mode -> either single position or loop over positions:
@@ -2775,7 +2875,7 @@ class GuiMicroscope:
                 # record gui delay:
                 if (not self.delay_saved and os.path.exists(
                     self.folder_name)):
-                    with open(self.folder_name + '\\'  "gui_delay_s.txt",
+                    with open(os.path.join(self.folder_name, "gui_delay_s.txt"),
                               "w") as file:
                         file.write(self.folder_name + '\n')
                         file.write(
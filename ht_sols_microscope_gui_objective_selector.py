@@ -25,9 +25,8 @@ class ObjectiveSelector:
         O1_options = ht_sols.objective1_options['name']
         O1_positions_um = ht_sols.objective1_options['BFP_um']
         # check position:
-        p0 = None
-        if z_um in O1_positions_um:
-            p0 = O1_positions_um.index(z_um)
+        p0 = ht_sols.objective1_BFP_um_to_index.get(z_um)
+        if p0 is not None:
             if verbose:
                 print('%s: current position   = %s'%(name, O1_options[p0]))
         if verbose: